@@ -12,17 +12,74 @@ import os
 import re
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Set, Any
+from typing import Dict, List, Set, Any, Tuple
+
+
+# Character column definitions shared by the DDL and the pre-flight validator.
+# Lengths use Oracle's default BYTE length semantics.
+COLUMN_SPECS = {
+    'regions': {
+        'region_name': ('VARCHAR2', 100),
+    },
+    'subregions': {
+        'subregion_name': ('VARCHAR2', 100),
+    },
+    'countries': {
+        'common_name': ('VARCHAR2', 100),
+        'official_name': ('VARCHAR2', 200),
+        'cca2': ('CHAR', 2),
+        'cca3': ('CHAR', 3),
+        'ccn3': ('CHAR', 3),
+        'cioc': ('CHAR', 3),
+        'status': ('VARCHAR2', 50),
+        'un_regional_group': ('VARCHAR2', 100),
+        'capital': ('VARCHAR2', 500),
+        'latlng': ('VARCHAR2', 50),
+        'borders': ('VARCHAR2', 1000),
+        'tld': ('VARCHAR2', 200),
+        'currencies': ('VARCHAR2', 1000),
+        'languages': ('VARCHAR2', 1000),
+        'alt_spellings': ('VARCHAR2', 1000),
+        'flag_emoji': ('VARCHAR2', 10),
+    },
+}
+
+# Oracle database character sets mapped to (Python codec, max bytes per code point).
+# National-only character sets such as AL16UTF16 never store VARCHAR2/CHAR data.
+ORACLE_CHARSETS = {
+    'AL32UTF8': ('utf-8', 4),
+    'UTF8': ('cesu-8', 6),  # Supplementary characters are stored as 6-byte surrogate pairs
+    'WE8MSWIN1252': ('cp1252', 1),
+    'WE8ISO8859P1': ('latin-1', 1),
+    'US7ASCII': ('ascii', 1),
+}
+
+# Database character sets able to store every Unicode character
+UNICODE_CHARSETS = {'AL32UTF8', 'UTF8'}
+
+# Lone surrogates (e.g. from a truncated \uXXXX escape) cannot be encoded in any character set
+SURROGATE_PATTERN = re.compile('[\ud800-\udfff]')
+
+
+def column_type(table: str, column: str) -> str:
+    """Return the Oracle type declaration of a character column, e.g. VARCHAR2(100)"""
+    data_type, length = COLUMN_SPECS[table][column]
+    return f"{data_type}({length})"
 
 
 class OracleSQLGenerator:
-    def __init__(self, json_file: str, output_dir: str = "SQLs"):
+    def __init__(self, json_file: str, output_dir: str = "SQLs", charset: str = "AL32UTF8"):
+        if charset not in ORACLE_CHARSETS:
+            raise ValueError(f"Unsupported character set: {charset} "
+                             f"(expected one of {', '.join(sorted(ORACLE_CHARSETS))})")
+
         self.json_file = json_file
         self.output_dir = output_dir
+        self.charset = charset
         self.regions = set()
         self.subregions = set()
         self.countries = []
-        
+
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
@@ -59,7 +116,172 @@ class OracleSQLGenerator:
         if not arr:
             return ''
         return ', '.join(str(item) for item in arr)
-    
+
+    def byte_length(self, value: str) -> int:
+        """Return the stored length of a string in bytes in the target character set.
+
+        Raises UnicodeEncodeError if the character set cannot represent the value,
+        since Oracle would silently store a replacement character instead.
+        """
+        codec, _ = ORACLE_CHARSETS[self.charset]
+        if codec == 'cesu-8':
+            # Python has no CESU-8 codec: it matches UTF-8 except for supplementary
+            # characters, which take 6 bytes instead of 4
+            supplementary = sum(1 for char in value if ord(char) > 0xFFFF)
+            return len(value.encode('utf-8')) + 2 * supplementary
+        return len(value.encode(codec))
+
+    def build_id_mappings(self) -> Tuple[Dict[str, int], Dict[str, str], Dict[str, int]]:
+        """Build region ID, subregion-to-region and subregion ID mappings"""
+        # Create region name to ID mapping
+        sorted_regions = sorted(self.regions)
+        region_to_id = {region: idx for idx, region in enumerate(sorted_regions, 1)}
+
+        # Map subregions to their regions
+        subregion_to_region = {}
+        for country in self.countries:
+            region = country.get('region', '')
+            subregion = country.get('subregion', '')
+            if region and subregion:
+                subregion_to_region[subregion] = region
+
+        sorted_subregions = sorted(subregion_to_region.keys())
+        subregion_to_id = {subregion: idx for idx, subregion in enumerate(sorted_subregions, 1)}
+
+        return region_to_id, subregion_to_region, subregion_to_id
+
+    def build_country_row(self, country: Dict[str, Any], region_to_id: Dict[str, int],
+                          subregion_to_id: Dict[str, int]) -> Dict[str, Any]:
+        """Map a country JSON record to the column values of the countries table"""
+        name = country.get('name', {})
+        region = country.get('region', '')
+        subregion = country.get('subregion', '')
+
+        return {
+            # Basic information
+            'common_name': name.get('common', ''),
+            'official_name': name.get('official', ''),
+            'cca2': country.get('cca2', ''),
+            'cca3': country.get('cca3', ''),
+            'ccn3': country.get('ccn3', ''),
+            'cioc': country.get('cioc', ''),
+
+            # Status
+            'independent': 1 if country.get('independent', False) else 0,
+            'status': country.get('status', ''),
+            'un_member': 1 if country.get('unMember', False) else 0,
+            'un_regional_group': country.get('unRegionalGroup', ''),
+            'eu_member': 1 if country.get('euMember', False) else 0,
+            'efta_member': 1 if country.get('eftaMember', False) else 0,
+            'eea_member': 1 if country.get('eeaMember', False) else 0,
+
+            # Geographic
+            'region_id': region_to_id.get(region) if region else None,
+            'subregion_id': subregion_to_id.get(subregion) if subregion else None,
+            'capital': self.format_array_to_string(country.get('capital', [])),
+            'latlng': self.format_array_to_string(country.get('latlng', [])),
+            'landlocked': 1 if country.get('landlocked', False) else 0,
+            'borders': self.format_array_to_string(country.get('borders', [])),
+            'area': country.get('area', 0) or 0,
+
+            # Additional info
+            'tld': self.format_array_to_string(country.get('tld', [])),
+            'currencies': json.dumps(country.get('currencies', {}), ensure_ascii=False),
+            'languages': json.dumps(country.get('languages', {}), ensure_ascii=False),
+            'alt_spellings': self.format_array_to_string(country.get('altSpellings', [])),
+            'flag_emoji': country.get('flag', ''),
+        }
+
+    def validate_data(self) -> List[str]:
+        """Check the loaded data against the table definitions before any SQL is written.
+
+        Runs a single pass over the countries and returns every violation found:
+        values exceeding their column's byte length or not representable in the
+        target character set, missing common names, duplicate cca2/cca3 codes
+        and subregions that would not resolve to a foreign key. Subregion names
+        used under more than one region are only printed as warnings, since
+        Oracle accepts those rows.
+        """
+        print(f"Validating data against column limits ({self.charset})...")
+
+        violations = []
+        _, max_bytes_per_char = ORACLE_CHARSETS[self.charset]
+        unicode_charset = self.charset in UNICODE_CHARSETS
+        region_to_id, subregion_to_region, subregion_to_id = self.build_id_mappings()
+
+        def check_length(table: str, column: str, value: Any, label: str):
+            if value is None or value == '':
+                return
+            # Measure the text that escape_sql_string will actually insert
+            text = str(value)
+            _, limit = COLUMN_SPECS[table][column]
+            # Skip encoding when every character is storable and even the widest would fit
+            if (unicode_charset and len(text) * max_bytes_per_char <= limit
+                    and not SURROGATE_PATTERN.search(text)):
+                return
+            try:
+                size = self.byte_length(text)
+            except UnicodeEncodeError as e:
+                violations.append(f"{label}: {table}.{column} is not representable in "
+                                  f"{self.charset} ({e.object[e.start:e.end]!r}): {text!r}")
+                return
+            if size > limit:
+                violations.append(f"{label}: {table}.{column} is {size} bytes, "
+                                  f"exceeds {column_type(table, column)}: {text!r}")
+
+        for region in sorted(self.regions):
+            check_length('regions', 'region_name', region, f"Region {region!r}")
+        for subregion in sorted(subregion_to_region):
+            check_length('subregions', 'subregion_name', subregion, f"Subregion {subregion!r}")
+
+        country_columns = COLUMN_SPECS['countries']
+        seen_codes = {'cca2': {}, 'cca3': {}}
+        subregion_regions = defaultdict(lambda: defaultdict(list))
+
+        for position, country in enumerate(self.countries, 1):
+            row = self.build_country_row(country, region_to_id, subregion_to_id)
+            label = f"Country #{position} ({row['cca3'] or row['common_name'] or 'unnamed'})"
+
+            for column in country_columns:
+                check_length('countries', column, row[column], label)
+
+            if not row['common_name']:
+                violations.append(f"{label}: countries.common_name is NOT NULL but empty")
+
+            for column, seen in seen_codes.items():
+                code = row[column]
+                if not code:
+                    continue
+                if code in seen:
+                    violations.append(f"{label}: duplicate countries.{column} {code!r} "
+                                      f"(first used by country #{seen[code]})")
+                else:
+                    seen[code] = position
+
+            region = country.get('region', '')
+            subregion = country.get('subregion', '')
+            if subregion and row['subregion_id'] is None:
+                violations.append(f"{label}: subregion {subregion!r} does not resolve to a "
+                                  f"subregion_id (country has no region)")
+            elif region and subregion:
+                subregion_regions[subregion][region].append(label)
+
+        # A subregion row gets a single region_id, so one name under several
+        # regions would leave some countries in a subregion of another region
+        for subregion in sorted(subregion_regions):
+            regions = subregion_regions[subregion]
+            if len(regions) > 1:
+                details = '; '.join(f"{region!r}: {', '.join(labels)}"
+                                    for region, labels in sorted(regions.items()))
+                print(f"Warning: subregion {subregion!r} is used under {len(regions)} "
+                      f"regions ({details})")
+
+        if violations:
+            print(f"Found {len(violations)} violation(s)")
+        else:
+            print(f"All {len(self.countries)} countries passed validation")
+        return violations
+
     def generate_table_creation_scripts(self):
         """Generate table creation scripts"""
         print("Generating table creation scripts...")
@@ -77,14 +299,14 @@ DROP TABLE regions CASCADE CONSTRAINTS;
 -- Create REGIONS table
 CREATE TABLE regions (
     region_id NUMBER PRIMARY KEY,
-    region_name VARCHAR2(100) NOT NULL UNIQUE,
+    region_name {column_type('regions', 'region_name')} NOT NULL UNIQUE,
     created_date DATE DEFAULT SYSDATE
 );
 
 -- Create SUBREGIONS table
 CREATE TABLE subregions (
     subregion_id NUMBER PRIMARY KEY,
-    subregion_name VARCHAR2(100) NOT NULL,
+    subregion_name {column_type('subregions', 'subregion_name')} NOT NULL,
     region_id NUMBER,
     created_date DATE DEFAULT SYSDATE,
     CONSTRAINT fk_subregion_region FOREIGN KEY (region_id) REFERENCES regions(region_id),
@@ -95,18 +317,18 @@ CREATE TABLE subregions (
 CREATE TABLE countries (
     country_id NUMBER PRIMARY KEY,
     -- Basic country information
-    common_name VARCHAR2(100) NOT NULL,
-    official_name VARCHAR2(200),
-    cca2 CHAR(2) UNIQUE,
-    cca3 CHAR(3) UNIQUE,
-    ccn3 CHAR(3),
-    cioc CHAR(3),
+    common_name {column_type('countries', 'common_name')} NOT NULL,
+    official_name {column_type('countries', 'official_name')},
+    cca2 {column_type('countries', 'cca2')} UNIQUE,
+    cca3 {column_type('countries', 'cca3')} UNIQUE,
+    ccn3 {column_type('countries', 'ccn3')},
+    cioc {column_type('countries', 'cioc')},
     
     -- Status information
     independent NUMBER(1) DEFAULT 0,
-    status VARCHAR2(50),
+    status {column_type('countries', 'status')},
     un_member NUMBER(1) DEFAULT 0,
-    un_regional_group VARCHAR2(100),
+    un_regional_group {column_type('countries', 'un_regional_group')},
     eu_member NUMBER(1) DEFAULT 0,
     efta_member NUMBER(1) DEFAULT 0,
     eea_member NUMBER(1) DEFAULT 0,
@@ -114,18 +336,18 @@ CREATE TABLE countries (
     -- Geographic information
     region_id NUMBER,
     subregion_id NUMBER,
-    capital VARCHAR2(500), -- Can be multiple capitals
-    latlng VARCHAR2(50), -- Stored as "lat,lng"
+    capital {column_type('countries', 'capital')}, -- Can be multiple capitals
+    latlng {column_type('countries', 'latlng')}, -- Stored as "lat,lng"
     landlocked NUMBER(1) DEFAULT 0,
-    borders VARCHAR2(1000), -- Comma-separated country codes
+    borders {column_type('countries', 'borders')}, -- Comma-separated country codes
     area NUMBER,
     
     -- Additional information
-    tld VARCHAR2(200), -- Top-level domains
-    currencies VARCHAR2(1000), -- JSON string of currencies
-    languages VARCHAR2(1000), -- JSON string of languages
-    alt_spellings VARCHAR2(1000), -- Comma-separated alternative spellings
-    flag_emoji VARCHAR2(10),
+    tld {column_type('countries', 'tld')}, -- Top-level domains
+    currencies {column_type('countries', 'currencies')}, -- JSON string of currencies
+    languages {column_type('countries', 'languages')}, -- JSON string of languages
+    alt_spellings {column_type('countries', 'alt_spellings')}, -- Comma-separated alternative spellings
+    flag_emoji {column_type('countries', 'flag_emoji')},
     
     -- Metadata
     created_date DATE DEFAULT SYSDATE,
@@ -201,17 +423,8 @@ COMMIT;
         """Generate INSERT statements for subregions"""
         print("Generating subregions INSERT statements...")
         
-        # Map subregions to their regions
-        subregion_to_region = {}
-        for country in self.countries:
-            region = country.get('region', '')
-            subregion = country.get('subregion', '')
-            if region and subregion:
-                subregion_to_region[subregion] = region
-        
-        # Create region name to ID mapping
-        sorted_regions = sorted(self.regions)
-        region_to_id = {region: idx for idx, region in enumerate(sorted_regions, 1)}
+        # Create region ID and subregion-to-region mappings
+        region_to_id, subregion_to_region, _ = self.build_id_mappings()
         
         sql_content = f"""-- Insert statements for SUBREGIONS table
 -- Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -239,19 +452,7 @@ COMMIT;
         print("Generating countries INSERT statements...")
         
         # Create mappings for region and subregion IDs
-        sorted_regions = sorted(self.regions)
-        region_to_id = {region: idx for idx, region in enumerate(sorted_regions, 1)}
-        
-        # Map subregions to their regions and create subregion ID mapping
-        subregion_to_region = {}
-        for country in self.countries:
-            region = country.get('region', '')
-            subregion = country.get('subregion', '')
-            if region and subregion:
-                subregion_to_region[subregion] = region
-        
-        sorted_subregions = sorted(subregion_to_region.keys())
-        subregion_to_id = {subregion: idx for idx, subregion in enumerate(sorted_subregions, 1)}
+        region_to_id, _, subregion_to_id = self.build_id_mappings()
         
         sql_content = f"""-- Insert statements for COUNTRIES table
 -- Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -262,44 +463,7 @@ COMMIT;
         sorted_countries = sorted(self.countries, key=lambda x: x.get('name', {}).get('common', ''))
         
         for idx, country in enumerate(sorted_countries, 1):
-            name = country.get('name', {})
-            common_name = name.get('common', '')
-            official_name = name.get('official', '')
-            
-            # Basic codes
-            cca2 = country.get('cca2', '')
-            cca3 = country.get('cca3', '')
-            ccn3 = country.get('ccn3', '')
-            cioc = country.get('cioc', '')
-            
-            # Status
-            independent = 1 if country.get('independent', False) else 0
-            status = country.get('status', '')
-            un_member = 1 if country.get('unMember', False) else 0
-            un_regional_group = country.get('unRegionalGroup', '')
-            eu_member = 1 if country.get('euMember', False) else 0
-            efta_member = 1 if country.get('eftaMember', False) else 0
-            eea_member = 1 if country.get('eeaMember', False) else 0
-            
-            # Geographic
-            region = country.get('region', '')
-            subregion = country.get('subregion', '')
-            capital = self.format_array_to_string(country.get('capital', []))
-            latlng = self.format_array_to_string(country.get('latlng', []))
-            landlocked = 1 if country.get('landlocked', False) else 0
-            borders = self.format_array_to_string(country.get('borders', []))
-            area = country.get('area', 0) or 0
-            
-            # Get region and subregion IDs
-            region_id = region_to_id.get(region) if region else None
-            subregion_id = subregion_to_id.get(subregion) if subregion else None
-            
-            # Additional info
-            tld = self.format_array_to_string(country.get('tld', []))
-            currencies = json.dumps(country.get('currencies', {}), ensure_ascii=False)
-            languages = json.dumps(country.get('languages', {}), ensure_ascii=False)
-            alt_spellings = self.format_array_to_string(country.get('altSpellings', []))
-            flag_emoji = country.get('flag', '')
+            row = self.build_country_row(country, region_to_id, subregion_to_id)
             
             # Build INSERT statement
             sql_content += f"""INSERT INTO countries (
@@ -309,31 +473,31 @@ COMMIT;
     tld, currencies, languages, alt_spellings, flag_emoji
 ) VALUES (
     {idx},
-    {self.escape_sql_string(common_name)},
-    {self.escape_sql_string(official_name)},
-    {self.escape_sql_string(cca2) if cca2 else 'NULL'},
-    {self.escape_sql_string(cca3) if cca3 else 'NULL'},
-    {self.escape_sql_string(ccn3) if ccn3 else 'NULL'},
-    {self.escape_sql_string(cioc) if cioc else 'NULL'},
-    {independent},
-    {self.escape_sql_string(status)},
-    {un_member},
-    {self.escape_sql_string(un_regional_group)},
-    {eu_member},
-    {efta_member},
-    {eea_member},
-    {region_id if region_id else 'NULL'},
-    {subregion_id if subregion_id else 'NULL'},
-    {self.escape_sql_string(capital) if capital else 'NULL'},
-    {self.escape_sql_string(latlng) if latlng else 'NULL'},
-    {landlocked},
-    {self.escape_sql_string(borders) if borders else 'NULL'},
-    {area},
-    {self.escape_sql_string(tld) if tld else 'NULL'},
-    {self.escape_sql_string(currencies) if currencies != '{}' else 'NULL'},
-    {self.escape_sql_string(languages) if languages != '{}' else 'NULL'},
-    {self.escape_sql_string(alt_spellings) if alt_spellings else 'NULL'},
-    {self.escape_sql_string(flag_emoji) if flag_emoji else 'NULL'}
+    {self.escape_sql_string(row['common_name'])},
+    {self.escape_sql_string(row['official_name'])},
+    {self.escape_sql_string(row['cca2']) if row['cca2'] else 'NULL'},
+    {self.escape_sql_string(row['cca3']) if row['cca3'] else 'NULL'},
+    {self.escape_sql_string(row['ccn3']) if row['ccn3'] else 'NULL'},
+    {self.escape_sql_string(row['cioc']) if row['cioc'] else 'NULL'},
+    {row['independent']},
+    {self.escape_sql_string(row['status'])},
+    {row['un_member']},
+    {self.escape_sql_string(row['un_regional_group'])},
+    {row['eu_member']},
+    {row['efta_member']},
+    {row['eea_member']},
+    {row['region_id'] if row['region_id'] else 'NULL'},
+    {row['subregion_id'] if row['subregion_id'] else 'NULL'},
+    {self.escape_sql_string(row['capital']) if row['capital'] else 'NULL'},
+    {self.escape_sql_string(row['latlng']) if row['latlng'] else 'NULL'},
+    {row['landlocked']},
+    {self.escape_sql_string(row['borders']) if row['borders'] else 'NULL'},
+    {row['area']},
+    {self.escape_sql_string(row['tld']) if row['tld'] else 'NULL'},
+    {self.escape_sql_string(row['currencies']) if row['currencies'] != '{}' else 'NULL'},
+    {self.escape_sql_string(row['languages']) if row['languages'] != '{}' else 'NULL'},
+    {self.escape_sql_string(row['alt_spellings']) if row['alt_spellings'] else 'NULL'},
+    {self.escape_sql_string(row['flag_emoji']) if row['flag_emoji'] else 'NULL'}
 );
 
 """
@@ -524,6 +688,16 @@ FROM dual;
         # Load the data
         self.load_data()
         
+        # Validate everything before any SQL file is written
+        violations = self.validate_data()
+        if violations:
+            print("=" * 50)
+            for violation in violations:
+                print(f"  {violation}")
+            print("=" * 50)
+            print("Oracle SQL generation aborted: fix the violations above and rerun.")
+            return False
+        
         # Generate all SQL files
         self.generate_table_creation_scripts()
         self.generate_regions_insert()
@@ -544,6 +718,7 @@ FROM dual;
         print("\nTo execute:")
         print("  1. Connect to Oracle database")
         print("  2. Run: @00_master_script.sql")
+        return True
 
 
 def main():
@@ -553,12 +728,15 @@ def main():
     # Default values - use amended file if available, otherwise original
     json_file = "data/countries_amended.json" if os.path.exists("data/countries_amended.json") else "data/countries.json"
     output_dir = "SQLs"
+    charset = "AL32UTF8"
     
     # Check for command line arguments
     if len(sys.argv) > 1:
         json_file = sys.argv[1]
     if len(sys.argv) > 2:
         output_dir = sys.argv[2]
+    if len(sys.argv) > 3:
+        charset = sys.argv[3].upper()
     
     # Check if JSON file exists
     if not os.path.exists(json_file):
@@ -574,8 +752,13 @@ def main():
     print(f"Using JSON file: {json_file}")
     
     # Create generator and run
-    generator = OracleSQLGenerator(json_file, output_dir)
-    generator.generate_all()
+    try:
+        generator = OracleSQLGenerator(json_file, output_dir, charset)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not generator.generate_all():
+        sys.exit(1)
 
 
 if __name__ == "__main__":